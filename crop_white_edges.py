@@ -7,13 +7,34 @@ import cv2
 import numpy as np
 from pathlib import Path
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+import logging
 import sys
 import io
 
+from image_utils import (
+    PNG_COMPRESS_LEVEL,
+    drain_log_records,
+    init_worker_logging,
+    list_image_files,
+)
+
+try:
+    from numba import njit, prange, set_num_threads
+except ImportError:  # numba为可选依赖，未安装时使用OpenCV实现
+    njit = None
+
 # 设置Windows控制台输出编码为UTF-8
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
+logger = logging.getLogger(__name__)
+
+# 日志级别：改为 logging.DEBUG 可显示每张图片的尺寸和内容区域
+LOG_LEVEL = logging.INFO
+
 
 def imread_chinese(image_path):
     """
@@ -28,6 +49,107 @@ def imread_chinese(image_path):
     return Image.open(image_path)
 
 
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _row_content_extents(img, threshold):
+        """
+        并行扫描每一行，记录该行第一个和最后一个非白色像素的列号
+
+        从左向右找到第一个非白色像素后，改为从右向左找最后一个，
+        中间的像素不再读取；全白的行读取一遍即结束
+
+        Args:
+            img: uint8图片数组（H × W × C）
+            threshold: 白色阈值
+
+        Returns:
+            tuple: (每行最左列, 每行最右列)，没有内容的行分别为W和-1
+        """
+        height, width, channels = img.shape
+        row_left = np.full(height, width, np.int64)
+        row_right = np.full(height, -1, np.int64)
+
+        for y in prange(height):
+            # 从左向右找第一个非白色像素
+            first = width
+            for x in range(width):
+                is_content = False
+                for c in range(channels):
+                    if img[y, x, c] < threshold:
+                        is_content = True
+                        break
+                if is_content:
+                    first = x
+                    break
+
+            if first == width:
+                continue
+
+            # 从右向左找最后一个非白色像素，最多退回到first
+            last = first
+            for x in range(width - 1, first, -1):
+                is_content = False
+                for c in range(channels):
+                    if img[y, x, c] < threshold:
+                        is_content = True
+                        break
+                if is_content:
+                    last = x
+                    break
+
+            row_left[y] = first
+            row_right[y] = last
+
+        return row_left, row_right
+
+else:
+    _row_content_extents = None
+
+
+def find_content_bbox(img_array, threshold=250):
+    """
+    查找非白色内容的外接矩形
+
+    Args:
+        img_array: 图片数组（H × W 或 H × W × C）
+        threshold: 白色阈值（0-255），任一通道低于此值即为非白色像素
+
+    Returns:
+        tuple: (x, y, w, h)，整张图都是白色时返回None
+    """
+    if _row_content_extents is not None and img_array.dtype == np.uint8:
+        # 使用numba内核，只遍历一次像素
+        if len(img_array.shape) == 2:
+            img_array = img_array[:, :, np.newaxis]
+        row_left, row_right = _row_content_extents(img_array, threshold)
+
+        content_rows = np.flatnonzero(row_right >= 0)
+        if len(content_rows) == 0:
+            return None
+
+        top, bottom = content_rows[0], content_rows[-1]
+        left, right = row_left.min(), row_right.max()
+        return int(left), int(top), int(right - left + 1), int(bottom - top + 1)
+
+    # 逐通道两两取最小值（uint8，无需转为浮点）：最小值低于阈值即为非白色像素
+    # 注意不要用 img_array.min(axis=2)：长度为3的末轴归约走跨步循环，慢约20倍
+    if len(img_array.shape) == 3:
+        channel_min = img_array[:, :, 0]
+        for c in range(1, img_array.shape[2]):
+            channel_min = np.minimum(channel_min, img_array[:, :, c])
+        content_mask = channel_min < threshold
+    else:
+        content_mask = img_array < threshold
+
+    # 用OpenCV的boundingRect在uint8掩码上一次扫描得到内容外接矩形
+    x, y, w, h = cv2.boundingRect(content_mask.view(np.uint8))
+    if w == 0 or h == 0:
+        return None
+
+    return x, y, w, h
+
+
 def crop_white_edges(image, threshold=250, padding=10):
     """
     裁剪图片的白色边缘
@@ -40,42 +162,45 @@ def crop_white_edges(image, threshold=250, padding=10):
     Returns:
         PIL Image: 裁剪后的图片
     """
-    # 转换为numpy数组
-    img_array = np.array(image)
+    width, height = image.size
+
+    # 转换为numpy数组：asarray直接包装PIL导出的像素数据，不再额外复制一份
+    img_array = np.asarray(image)
     
     # 如果是RGBA，转换为RGB
     if img_array.shape[-1] == 4:
         img_array = img_array[:, :, :3]
     
-    # 转换为灰度图来检测白色区域
-    if len(img_array.shape) == 3:
-        gray = np.mean(img_array, axis=2)
-    else:
-        gray = img_array
-    
-    # 找到非白色像素的位置
-    non_white_pixels = np.where(gray < threshold)
-    
-    if len(non_white_pixels[0]) == 0 or len(non_white_pixels[1]) == 0:
+    # 查找非白色内容的外接矩形
+    bbox = find_content_bbox(img_array, threshold=threshold)
+
+    if bbox is None:
         # 如果整张图都是白色，返回原图
-        print("  ⚠️  警告：未检测到非白色内容")
+        logger.warning(
+            f"  ⚠️  警告：{Path(getattr(image, 'filename', '')).name} 未检测到非白色内容"
+        )
         return image
-    
+
     # 获取内容区域的边界
-    top = max(0, non_white_pixels[0].min() - padding)
-    bottom = min(img_array.shape[0], non_white_pixels[0].max() + padding + 1)
-    left = max(0, non_white_pixels[1].min() - padding)
-    right = min(img_array.shape[1], non_white_pixels[1].max() + padding + 1)
+    x, y, w, h = bbox
+    top = max(0, y - padding)
+    bottom = min(height, y + h + padding)
+    left = max(0, x - padding)
+    right = min(width, x + w + padding)
     
     # 计算裁剪比例
-    original_size = img_array.shape[0] * img_array.shape[1]
+    original_size = width * height
     cropped_size = (bottom - top) * (right - left)
     size_ratio = cropped_size / original_size * 100
     
-    print(f"  原始尺寸: {img_array.shape[1]} × {img_array.shape[0]}")
-    print(f"  内容区域: [{left}:{right}, {top}:{bottom}]")
-    print(f"  裁剪后尺寸: {right - left} × {bottom - top}")
-    print(f"  内容占比: {size_ratio:.1f}%")
+    # 详细信息汇总为一条日志，多进程输出时不会与其他图片交错
+    logger.debug(
+        f"  {Path(getattr(image, 'filename', '')).name}\n"
+        f"    原始尺寸: {width} × {height}\n"
+        f"    内容区域: [{left}:{right}, {top}:{bottom}]\n"
+        f"    裁剪后尺寸: {right - left} × {bottom - top}\n"
+        f"    内容占比: {size_ratio:.1f}%"
+    )
     
     # 裁剪图片
     cropped_image = image.crop((left, top, right, bottom))
@@ -83,7 +208,54 @@ def crop_white_edges(image, threshold=250, padding=10):
     return cropped_image
 
 
-def batch_crop_white_edges(input_folder, output_folder, threshold=250, padding=10):
+def _init_worker(log_level):
+    """
+    子进程初始化：限制numba线程数，日志交给主进程输出
+    
+    Args:
+        log_level: 日志级别
+    """
+    # 进程池已经按CPU核心数并行，每个子进程内的numba内核只用单线程，
+    # 否则线程总数为核心数的平方；处理单张图片时仍使用多线程内核
+    if njit is not None:
+        set_num_threads(1)
+    
+    init_worker_logging(logger, log_level)
+
+
+def _crop_one(task):
+    """
+    裁剪单张图片并保存（在子进程中运行）
+    
+    Args:
+        task: (图片路径, 输出文件夹, 白色阈值, 保留边距)
+        
+    Returns:
+        tuple: (错误信息, 日志记录列表)，成功时错误信息为None
+    """
+    img_file, output_path, threshold, padding = task
+    error = None
+    
+    try:
+        # 读取图片
+        img = imread_chinese(str(img_file))
+        
+        # 裁剪白色边缘
+        cropped_img = crop_white_edges(img, threshold=threshold, padding=padding)
+        
+        # 保存裁剪后的图片
+        output_file = output_path / img_file.name
+        cropped_img.save(output_file, compress_level=PNG_COMPRESS_LEVEL)
+        
+    except Exception as e:
+        error = str(e)
+    
+    return error, drain_log_records()
+
+
+def batch_crop_white_edges(
+    input_folder, output_folder, threshold=250, padding=10, max_workers=None
+):
     """
     批量裁剪图片的白色边缘
     
@@ -92,6 +264,7 @@ def batch_crop_white_edges(input_folder, output_folder, threshold=250, padding=1
         output_folder: 输出文件夹路径
         threshold: 白色阈值（0-255）
         padding: 裁剪后保留的边距（像素）
+        max_workers: 并行处理的进程数，默认为CPU核心数
     """
     input_path = Path(input_folder)
     output_path = Path(output_folder)
@@ -106,11 +279,7 @@ def batch_crop_white_edges(input_folder, output_folder, threshold=250, padding=1
     print("=" * 70)
     
     # 获取所有图片文件
-    image_files = (
-        list(input_path.glob("*.png"))
-        + list(input_path.glob("*.jpg"))
-        + list(input_path.glob("*.jpeg"))
-    )
+    image_files = list_image_files(input_path)
     
     if not image_files:
         print(f"错误: 在 {input_folder} 中未找到图片文件")
@@ -122,29 +291,36 @@ def batch_crop_white_edges(input_folder, output_folder, threshold=250, padding=1
     success_count = 0
     failed_count = 0
     
-    # 处理每张图片
-    for idx, img_file in enumerate(image_files, 1):
-        print(f"[{idx}/{len(image_files)}] 处理: {img_file.name}")
-        
-        try:
-            # 读取图片
-            img = imread_chinese(str(img_file))
-            
-            # 裁剪白色边缘
-            cropped_img = crop_white_edges(img, threshold=threshold, padding=padding)
-            
-            # 保存裁剪后的图片
-            output_file = output_path / img_file.name
-            cropped_img.save(output_file)
-            
-            print(f"  ✓ 保存至: {output_file}")
-            success_count += 1
-            
-        except Exception as e:
-            print(f"  ✗ 处理失败: {e}")
-            failed_count += 1
+    # 多进程并行处理，结果按原顺序返回，用进度条代替逐张输出
+    tasks = [
+        (img_file, output_path, threshold, padding)
+        for img_file in image_files
+    ]
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(logger.getEffectiveLevel(),),
+    ) as executor:
+        results = executor.map(_crop_one, tasks, chunksize=4)
         
-        print()
+        with logging_redirect_tqdm():
+            for img_file, (error, records) in tqdm(
+                zip(image_files, results),
+                total=len(image_files),
+                desc="裁剪白边",
+                unit="张",
+            ):
+                # 子进程的警告和详细信息在这里输出，不会打断进度条
+                for record in records:
+                    logger.handle(record)
+
+                if error is None:
+                    success_count += 1
+                else:
+                    failed_count += 1
+                    logger.warning(f"  ✗ {img_file.name} 处理失败: {error}")
+    
+    print()
     
     # 显示统计结果
     print("=" * 70)
@@ -188,7 +364,7 @@ def process_single_image(image_path, output_path=None, threshold=250, padding=10
         cropped_img = crop_white_edges(img, threshold=threshold, padding=padding)
         
         # 保存裁剪后的图片
-        cropped_img.save(output_path)
+        cropped_img.save(output_path, compress_level=PNG_COMPRESS_LEVEL)
         
         print(f"✓ 保存至: {output_path}")
         print(f"\n处理完成！")
@@ -199,6 +375,9 @@ def process_single_image(image_path, output_path=None, threshold=250, padding=10
 
 def main():
     """主函数"""
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(LOG_LEVEL)
+    
     print("=" * 70)
     print("图片白色边缘自动裁剪工具")
     print("=" * 70)
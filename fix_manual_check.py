@@ -5,16 +5,97 @@
 
 from pathlib import Path
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import shutil
+import subprocess
 import sys
 
+from image_utils import PNG_COMPRESS_LEVEL, list_image_files
 
-def rotate_images_180(input_folder="output/manual_check", output_folder="output"):
+logger = logging.getLogger(__name__)
+
+# 日志级别：改为 logging.WARNING 可不显示每张图片的处理结果
+LOG_LEVEL = logging.INFO
+
+
+def _rotate_jpeg_lossless(input_file, output_file):
+    """
+    使用jpegtran将JPEG图片无损旋转180度（直接重排DCT系数，不解码也不重新编码）
+
+    Args:
+        input_file: 输入图片路径
+        output_file: 输出图片路径
+
+    Returns:
+        bool: 是否成功；未安装jpegtran或图片尺寸无法完美无损旋转时返回False
+    """
+    jpegtran = shutil.which("jpegtran")
+    if jpegtran is None:
+        return False
+
+    result = subprocess.run(
+        [
+            jpegtran,
+            "-rotate", "180",
+            "-perfect",
+            "-copy", "all",
+            "-outfile", str(output_file),
+            str(input_file),
+        ],
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def _rotate_one(task):
+    """
+    旋转单张图片180度并移动到主输出文件夹（在子进程中运行）
+
+    Args:
+        task: (图片路径, 主输出文件夹路径)
+
+    Returns:
+        tuple: (保存的文件路径, 是否为无损旋转, 错误信息)，成功时错误信息为None
+    """
+    img_file, output_path = task
+    output_file = output_path / img_file.name
+    lossless = False
+
+    try:
+        # JPEG优先无损旋转，避免再次有损编码
+        is_jpeg = img_file.suffix.lower() in (".jpg", ".jpeg")
+        lossless = is_jpeg and _rotate_jpeg_lossless(img_file, output_file)
+
+        if not lossless:
+            # 读取图片
+            with Image.open(img_file) as img:
+                # 旋转180度（转置只复制像素，无需重采样）
+                img_rotated = img.transpose(Image.Transpose.ROTATE_180)
+
+            # 保存到主输出文件夹
+            img_rotated.save(output_file, compress_level=PNG_COMPRESS_LEVEL)
+
+    except Exception as e:
+        # 处理失败时保留原文件
+        return output_file, lossless, str(e)
+
+    # 保存成功后再删除原文件
+    img_file.unlink()
+
+    return output_file, lossless, None
+
+
+def rotate_images_180(
+    input_folder="output/manual_check", output_folder="output", max_workers=None
+):
     """
     将人工检查文件夹中的图片旋转180度并移动到主输出文件夹
 
     Args:
         input_folder: manual_check文件夹路径
         output_folder: 主输出文件夹路径
+        max_workers: 并行处理的进程数，默认为CPU核心数
     """
     manual_check_path = Path(input_folder)
     output_path = Path(output_folder)
@@ -24,11 +105,7 @@ def rotate_images_180(input_folder="output/manual_check", output_folder="output"
         return
 
     # 获取所有图片文件
-    image_files = (
-        list(manual_check_path.glob("*.png"))
-        + list(manual_check_path.glob("*.jpg"))
-        + list(manual_check_path.glob("*.jpeg"))
-    )
+    image_files = list_image_files(manual_check_path)
 
     if not image_files:
         print(f"没有找到需要处理的图片")
@@ -36,28 +113,40 @@ def rotate_images_180(input_folder="output/manual_check", output_folder="output"
 
     print(f"找到 {len(image_files)} 张需要旋转的图片\n")
 
-    for idx, img_file in enumerate(image_files, 1):
-        print(f"[{idx}/{len(image_files)}] 处理: {img_file.name}")
-
-        # 读取图片
-        img = Image.open(img_file)
-
-        # 旋转180度
-        img_rotated = img.rotate(180, expand=True)
-
-        # 保存到主输出文件夹
-        output_file = output_path / img_file.name
-        img_rotated.save(output_file)
-
-        print(f"  ✓ 已旋转180度并保存至: {output_file}")
-
-        # 删除原文件
-        img_file.unlink()
-        print(f"  ✓ 已删除原文件")
-        print()
+    # 统计信息
+    success_count = 0
+    failed_count = 0
+
+    # 多进程并行处理，结果按原顺序返回
+    tasks = [(img_file, output_path) for img_file in image_files]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_rotate_one, tasks, chunksize=4)
+
+        for idx, (img_file, (output_file, lossless, error)) in enumerate(
+            zip(image_files, results), 1
+        ):
+            progress = f"[{idx}/{len(image_files)}] {img_file.name}"
+
+            # 每张图片只输出一行
+            if error is None:
+                success_count += 1
+                logger.info(
+                    f"{progress}  "
+                    f"✓ 已{'无损' if lossless else ''}旋转180度并移动至: {output_file}"
+                )
+            else:
+                failed_count += 1
+                logger.warning(f"{progress}  ✗ 处理失败: {error}")
 
+    print()
     print("=" * 70)
-    print(f"完成！所有 {len(image_files)} 张图片已旋转180度并移动到主输出文件夹")
+    if failed_count == 0:
+        print(f"完成！所有 {len(image_files)} 张图片已旋转180度并移动到主输出文件夹")
+    else:
+        print("处理完成！")
+        print(f"总计: {len(image_files)} 张图片")
+        print(f"  - 成功: {success_count} 张")
+        print(f"  - 失败: {failed_count} 张（原文件保留在 manual_check 中）")
 
     # 检查manual_check文件夹是否为空
     remaining_files = list(manual_check_path.glob("*"))
@@ -66,6 +155,9 @@ def rotate_images_180(input_folder="output/manual_check", output_folder="output"
 
 
 def main():
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(LOG_LEVEL)
+
     print("=" * 70)
     print("修复人工检查文件夹中的图片（旋转180度）")
     print("=" * 70)
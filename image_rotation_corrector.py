@@ -6,134 +6,443 @@
 import cv2
 import numpy as np
 from pathlib import Path
-from skimage.metrics import structural_similarity as ssim
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import logging
 import sys
 import io
 
+from image_utils import PNG_COMPRESS_LEVEL, list_image_files
+
 # 设置Windows控制台输出编码为UTF-8
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
+logger = logging.getLogger(__name__)
+
 # 相似度差异阈值：如果最佳角度与次佳角度的相似度差异小于此值，标记为需要人工检查
 SIMILARITY_THRESHOLD = 0.015  # 1.5%的差异阈值
 
+# 计算相似度前统一缩放到的尺寸：只需区分4个方向，128×128已足够
+# 如果出现较多需要人工检查的图片，可以改为 (256, 256)
+SSIM_SIZE = (128, 128)
+
+# SSIM参数，与 skimage.metrics.structural_similarity 的默认值一致
+SSIM_WIN_SIZE = 7
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+
+# 样本协方差的修正系数 N/(N-1)
+_SSIM_COV_NORM = SSIM_WIN_SIZE**2 / (SSIM_WIN_SIZE**2 - 1)
+
+# 日志级别：改为 logging.DEBUG 可显示每张图片各角度的相似度和保存路径
+LOG_LEVEL = logging.INFO
+
+# 依次尝试的旋转角度（顺时针）
+ANGLES = (0, 90, 180, 270)
+
+# 提前结束阈值：默认 None，始终计算全部4个角度
+# 设为数值（如 0.85）时，0°和180°中较高者超过此值、且领先另一个至少
+# SIMILARITY_THRESHOLD，就不再计算90°和270°
+# 注意：白色区域较多的页面各角度相似度都很高，提前结束可能选错方向
+EARLY_EXIT_THRESHOLD = None
+
+# 各角度对应的OpenCV旋转方式（顺时针）
+_CV_ROTATIONS = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
 
-def calculate_similarity(img1, img2):
+# 保存时对应的PIL转置方式（PIL按逆时针计算，顺时针90°即逆时针270°）
+_PIL_ROTATIONS = {
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+
+# 子进程共享的预处理参考图片，由 _init_worker 在每个子进程启动时设置
+_reference_gray = None
+
+# 当前进程复用的SSIM计算缓存，由 calculate_similarity 按需创建
+_ssim_context = None
+
+
+def prepare_for_ssim(img):
     """
-    计算两张图片的结构相似度
+    将图片缩放到统一尺寸并转为灰度图，供结构相似度计算使用
 
     Args:
-        img1: 第一张图片（numpy数组）
-        img2: 第二张图片（numpy数组）
+        img: 图片（numpy数组）
 
     Returns:
-        float: 相似度分数（0-1之间）
+        numpy数组: 缩放后的灰度图
     """
-    # 统一尺寸（缩小以加快计算速度）
-    target_size = (400, 400)
-    img1_resized = cv2.resize(img1, target_size)
-    img2_resized = cv2.resize(img2, target_size)
+    # 统一尺寸（缩小以加快计算速度，INTER_AREA缩小时不会产生混叠）
+    img_resized = cv2.resize(img, SSIM_SIZE, interpolation=cv2.INTER_AREA)
 
     # 转为灰度图
-    if len(img1_resized.shape) == 3:
-        img1_gray = cv2.cvtColor(img1_resized, cv2.COLOR_BGR2GRAY)
-    else:
-        img1_gray = img1_resized
+    if len(img_resized.shape) == 3:
+        return cv2.cvtColor(img_resized, cv2.COLOR_BGR2GRAY)
+    return img_resized
+
+
+class SSIMContext:
+    """
+    fast_ssim 的计算缓存：一维滤波核、预分配的float32中间结果缓冲区，
+    以及参考图片（img1）的局部均值和方差
+
+    同一进程中对相同尺寸的图片重复计算时复用同一个对象，
+    每次调用不再重新分配内存；参考图片不变时其统计量只计算一次
+    （因此参考图片数组不应被原地修改）
+    """
+
+    def __init__(self, shape):
+        """
+        Args:
+            shape: 灰度图尺寸（高, 宽）
+        """
+        self.shape = tuple(shape)
+        self.kernel = np.full(SSIM_WIN_SIZE, 1.0 / SSIM_WIN_SIZE, dtype=np.float32)
+
+        def buffer():
+            return np.empty(self.shape, dtype=np.float32)
+
+        self.x, self.y, self.tmp = buffer(), buffer(), buffer()
+        self.mu1, self.mu2 = buffer(), buffer()
+        self.mu1_sq, self.mu2_sq, self.mu1_mu2 = buffer(), buffer(), buffer()
+        self.sigma1_sq, self.sigma2_sq, self.sigma12 = buffer(), buffer(), buffer()
+
+        # 参考图片及其float32副本，由 set_reference 设置
+        self.reference = None
+        self.reference_x = buffer()
+
+    def local_mean(self, src, dst):
+        """
+        计算7×7窗口的局部均值
+
+        Args:
+            src: 输入float32数组
+            dst: 输出float32数组
+        """
+        cv2.sepFilter2D(
+            src,
+            cv2.CV_32F,
+            self.kernel,
+            self.kernel,
+            dst=dst,
+            borderType=cv2.BORDER_REFLECT,
+        )
+
+    def set_reference(self, img1):
+        """
+        计算并缓存参考图片的局部均值、均值平方和局部方差
+
+        Args:
+            img1: 参考灰度图（numpy数组）
+        """
+        self.reference = img1
+        np.copyto(self.reference_x, img1)
+
+        self.local_mean(self.reference_x, self.mu1)
+        np.multiply(self.reference_x, self.reference_x, out=self.tmp)
+        self.local_mean(self.tmp, self.sigma1_sq)
+        np.multiply(self.mu1, self.mu1, out=self.mu1_sq)
+
+        # 局部方差（样本协方差）
+        np.subtract(self.sigma1_sq, self.mu1_sq, out=self.sigma1_sq)
+        self.sigma1_sq *= _SSIM_COV_NORM
 
-    if len(img2_resized.shape) == 3:
-        img2_gray = cv2.cvtColor(img2_resized, cv2.COLOR_BGR2GRAY)
-    else:
-        img2_gray = img2_resized
+
+def fast_ssim(img1, img2, data_range=255, context=None):
+    """
+    计算两张灰度图的平均结构相似度
+
+    与 skimage.metrics.structural_similarity 的默认计算方式一致（7×7均值窗口、
+    样本协方差、去除边缘后取平均），但使用OpenCV的可分离滤波在float32上计算
+
+    Args:
+        img1: 第一张灰度图（numpy数组），重复计算时作为参考图片缓存其统计量
+        img2: 第二张灰度图（numpy数组，尺寸与img1相同）
+        data_range: 像素值范围，uint8图片为255
+        context: SSIMContext缓存，为None或尺寸不符时临时创建
+
+    Returns:
+        float: 平均结构相似度
+    """
+    if context is None or context.shape != img1.shape:
+        context = SSIMContext(img1.shape)
+    c = context
+
+    # 参考图片不变时直接复用其局部均值和方差
+    if c.reference is not img1:
+        c.set_reference(img1)
+
+    np.copyto(c.y, img2)
+
+    # 局部均值与二阶矩
+    c.local_mean(c.y, c.mu2)
+    np.multiply(c.y, c.y, out=c.tmp)
+    c.local_mean(c.tmp, c.sigma2_sq)
+    np.multiply(c.reference_x, c.y, out=c.tmp)
+    c.local_mean(c.tmp, c.sigma12)
+
+    # 局部方差与协方差（样本协方差）
+    np.multiply(c.mu2, c.mu2, out=c.mu2_sq)
+    np.multiply(c.mu1, c.mu2, out=c.mu1_mu2)
+    for sigma, mu_product in (
+        (c.sigma2_sq, c.mu2_sq),
+        (c.sigma12, c.mu1_mu2),
+    ):
+        np.subtract(sigma, mu_product, out=sigma)
+        sigma *= _SSIM_COV_NORM
+
+    c1 = (SSIM_K1 * data_range) ** 2
+    c2 = (SSIM_K2 * data_range) ** 2
+
+    # 分子 (2·μ1μ2 + C1)(2·σ12 + C2)，复用x、y缓冲区
+    np.multiply(c.mu1_mu2, 2, out=c.x)
+    c.x += c1
+    np.multiply(c.sigma12, 2, out=c.y)
+    c.y += c2
+    c.x *= c.y
+
+    # 分母 (μ1² + μ2² + C1)(σ1² + σ2² + C2)
+    np.add(c.mu1_sq, c.mu2_sq, out=c.tmp)
+    c.tmp += c1
+    np.add(c.sigma1_sq, c.sigma2_sq, out=c.y)
+    c.y += c2
+    c.tmp *= c.y
+
+    c.x /= c.tmp
+
+    # 去除受边界填充影响的边缘后取平均
+    pad = (SSIM_WIN_SIZE - 1) // 2
+    return float(c.x[pad:-pad, pad:-pad].mean(dtype=np.float64))
+
+
+def calculate_similarity(reference_gray, test_gray):
+    """
+    计算图片与参考图片的结构相似度
+
+    Args:
+        reference_gray: 预处理后的参考图片（prepare_for_ssim的返回值）
+        test_gray: 预处理后的待比较图片（prepare_for_ssim的返回值）
+
+    Returns:
+        float: 相似度分数（0-1之间）
+    """
+    global _ssim_context
+
+    # 同一进程内复用计算缓存
+    if _ssim_context is None or _ssim_context.shape != reference_gray.shape:
+        _ssim_context = SSIMContext(reference_gray.shape)
 
     # 计算结构相似度
-    similarity = ssim(img1_gray, img2_gray)
+    similarity = fast_ssim(reference_gray, test_gray, context=_ssim_context)
     return similarity
 
 
-def imread_chinese(image_path):
+def imread_gray(image_path, reduced=True):
     """
-    读取包含中文路径的图片
+    读取包含中文路径的图片，直接得到灰度图
 
     Args:
         image_path: 图片路径
+        reduced: 是否以1/2分辨率解码，默认True（仅用于计算相似度）
 
     Returns:
-        numpy数组格式的图片（BGR格式）
+        numpy数组格式的灰度图（uint8）
+
+    Raises:
+        ValueError: 图片无法解码时抛出
     """
-    # 使用PIL读取图片，然后转换为OpenCV格式
-    img_pil = Image.open(image_path)
-    img_rgb = np.array(img_pil)
+    # 先读入字节再由OpenCV解码，支持中文路径；JPEG可在解码时直接缩小并跳过彩色转换
+    # 忽略EXIF方向信息，与保存时PIL读取到的像素方向保持一致
+    flags = cv2.IMREAD_IGNORE_ORIENTATION
+    flags |= cv2.IMREAD_REDUCED_GRAYSCALE_2 if reduced else cv2.IMREAD_GRAYSCALE
+    img = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), flags)
+
+    if img is None:
+        raise ValueError("无法解码图片")
 
-    # 如果是RGBA，转换为RGB
-    if img_rgb.shape[-1] == 4:
-        img_rgb = cv2.cvtColor(img_rgb, cv2.COLOR_RGBA2RGB)
+    return img
 
-    # PIL是RGB，OpenCV是BGR，需要转换
-    if len(img_rgb.shape) == 3:
-        img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-    else:
-        img_bgr = img_rgb
 
-    return img_bgr
+def score_rotations(test_img, reference_gray):
+    """
+    计算待检测图片旋转4个角度后与参考图片的相似度
 
+    Args:
+        test_img: 待检测图片的灰度图（imread_gray的返回值）
+        reference_gray: 预处理后的参考图片（prepare_for_ssim的返回值）
 
-def find_correct_rotation(image_path, reference_img):
+    Returns:
+        numpy数组: 依次为 0°、90°、180°、270° 的相似度，
+                   因提前结束而未计算的角度为 -inf
+    """
+    # 先缩放并灰度化一次，再旋转缩小后的灰度图
+    # （缩放到正方形与旋转可以交换顺序，旋转小图代价低得多）
+    test_gray = prepare_for_ssim(test_img)
+
+    # 未计算的角度保持为 -inf
+    scores = np.full(len(ANGLES), -np.inf)
+
+    def score(angle):
+        # 旋转图片并计算与参考图片的相似度
+        if angle == 0:
+            rotated = test_gray
+        else:
+            rotated = cv2.rotate(test_gray, _CV_ROTATIONS[angle])
+        scores[ANGLES.index(angle)] = calculate_similarity(reference_gray, rotated)
+
+    # 先计算0°和最常见的180°
+    score(0)
+    score(180)
+
+    # 0°与180°中较高者足够高且明显领先时，不再计算90°和270°
+    if EARLY_EXIT_THRESHOLD is not None:
+        best, other = sorted(scores[[ANGLES.index(0), ANGLES.index(180)]])[::-1]
+        if best > EARLY_EXIT_THRESHOLD and best - other >= SIMILARITY_THRESHOLD:
+            return scores
+
+    score(90)
+    score(270)
+
+    return scores
+
+
+def select_rotations(scores_matrix):
+    """
+    根据相似度一次性为多张图片选出最佳角度，并判断是否需要人工检查
+
+    Args:
+        scores_matrix: (N, 4) 数组，每行依次为 0°、90°、180°、270° 的相似度，
+                       未计算的角度为 -inf
+
+    Returns:
+        tuple: (最佳角度, 最佳相似度, 最佳与次佳的相似度差异, 是否需要人工检查)，
+               均为长度N的numpy数组
+    """
+    best_angles = np.asarray(ANGLES)[scores_matrix.argmax(axis=1)]
+
+    # 每行取最大的两个相似度（取负后partition，前两列即最大和次大）
+    top2 = -np.partition(-scores_matrix, 1, axis=1)[:, :2]
+    best_similarities = top2[:, 0]
+    similarity_diffs = top2[:, 0] - top2[:, 1]
+
+    # 如果最佳和次佳相似度太接近，标记为需要人工检查
+    # （0°和180°总会计算，次佳不会是未计算的 -inf）
+    needs_manual_checks = similarity_diffs < SIMILARITY_THRESHOLD
+
+    return best_angles, best_similarities, similarity_diffs, needs_manual_checks
+
+
+def find_correct_rotation(image_path, reference_gray):
     """
     通过与参考图片对比，找到正确的旋转角度
 
     Args:
         image_path: 待检测图片路径
-        reference_img: 参考图片（numpy数组）
+        reference_gray: 预处理后的参考图片（prepare_for_ssim的返回值）
 
     Returns:
-        tuple: (最佳角度, 最佳相似度, 相似度字典, 是否需要人工检查)
+        tuple: (最佳角度, 最佳相似度, 相似度字典, 是否需要人工检查)，
+               相似度字典不包含因提前结束而跳过的角度
     """
-    # 读取待检测图片（支持中文路径）
+    # 读取待检测图片（支持中文路径），只有读取失败才按无法读取处理
     try:
-        test_img = imread_chinese(image_path)
+        test_img = imread_gray(image_path)
     except Exception as e:
-        print(f"  ✗ 无法读取图片: {image_path}, 错误: {e}")
+        logger.error(f"  ✗ 无法读取图片: {image_path}, 错误: {e}")
         return 0, 0, {}, False
 
-    # 尝试4个角度（0, 90, 180, 270度）
-    best_angle = 0
-    best_similarity = 0
-    similarity_scores = {}
+    scores = score_rotations(test_img, reference_gray)
 
-    for angle in [0, 90, 180, 270]:
-        # 旋转图片
-        if angle == 0:
-            rotated = test_img
-        elif angle == 90:
-            rotated = cv2.rotate(test_img, cv2.ROTATE_90_CLOCKWISE)
-        elif angle == 180:
-            rotated = cv2.rotate(test_img, cv2.ROTATE_180)
-        else:  # 270
-            rotated = cv2.rotate(test_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-
-        # 计算与参考图片的相似度
-        similarity = calculate_similarity(reference_img, rotated)
-        similarity_scores[angle] = similarity
-
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_angle = angle
-
-    # 检查相似度差异是否足够大
-    sorted_similarities = sorted(similarity_scores.values(), reverse=True)
-    second_best_similarity = (
-        sorted_similarities[1] if len(sorted_similarities) > 1 else 0
+    angles, similarities, _, needs_manual_checks = select_rotations(
+        scores[np.newaxis, :]
+    )
+    # 相似度字典只包含实际计算过的角度
+    similarity_scores = {
+        angle: score
+        for angle, score in zip(ANGLES, scores.tolist())
+        if np.isfinite(score)
+    }
+
+    return (
+        int(angles[0]),
+        float(similarities[0]),
+        similarity_scores,
+        bool(needs_manual_checks[0]),
     )
-    similarity_diff = best_similarity - second_best_similarity
 
-    # 如果最佳和次佳相似度太接近，标记为需要人工检查
-    needs_manual_check = similarity_diff < SIMILARITY_THRESHOLD
 
-    return best_angle, best_similarity, similarity_scores, needs_manual_check
+def _init_worker(reference_gray):
+    """
+    子进程初始化：保存预处理后的参考图片，避免每个任务重复传输
+
+    Args:
+        reference_gray: 预处理后的参考图片（prepare_for_ssim的返回值）
+    """
+    global _reference_gray
+    _reference_gray = reference_gray
+
+
+def _score_one(img_file):
+    """
+    计算单张图片各角度的相似度（在子进程中运行）
+
+    Args:
+        img_file: 图片路径
+
+    Returns:
+        tuple: (各角度相似度数组, 错误信息)，处理失败时相似度数组为None
+    """
+    try:
+        test_img = imread_gray(str(img_file))
+    except Exception as e:
+        return None, f"无法读取图片: {e}"
+
+    try:
+        return score_rotations(test_img, _reference_gray), None
+    except Exception as e:
+        return None, f"计算相似度失败: {e}"
+
+
+def _save_rotated(task):
+    """
+    按指定角度旋转图片并保存（在子进程中运行）
+
+    Args:
+        task: (图片路径, 旋转角度, 输出文件路径)
+
+    Returns:
+        str: 保存失败时的错误信息，成功时为None
+    """
+    img_file, angle, output_file = task
+
+    try:
+        # 读取并旋转图片（使用PIL以保持高质量）
+        img = Image.open(img_file)
+
+        if angle != 0:
+            # 直角旋转用转置完成，只复制像素，无需重采样
+            img_rotated = img.transpose(_PIL_ROTATIONS[angle])
+        else:
+            img_rotated = img
+
+        # 保存图片
+        img_rotated.save(output_file, compress_level=PNG_COMPRESS_LEVEL)
 
+        return None
 
-def batch_correct_with_template(input_folder, output_folder, reference_image):
+    except Exception as e:
+        return str(e)
+
+
+def batch_correct_with_template(
+    input_folder, output_folder, reference_image, max_workers=None
+):
     """
     批量矫正图片方向
 
@@ -141,6 +450,7 @@ def batch_correct_with_template(input_folder, output_folder, reference_image):
         input_folder: 输入文件夹路径
         output_folder: 输出文件夹路径
         reference_image: 参考图片路径
+        max_workers: 并行处理的进程数，默认为CPU核心数
     """
     input_path = Path(input_folder)
     output_path = Path(output_folder)
@@ -153,23 +463,23 @@ def batch_correct_with_template(input_folder, output_folder, reference_image):
     # 读取参考图片（支持中文路径）
     print(f"正在加载参考图片: {reference_image}")
     try:
-        reference_img = imread_chinese(reference_image)
+        reference_img = imread_gray(reference_image, reduced=False)
     except Exception as e:
         print(f"错误: 无法读取参考图片 {reference_image}")
         print(f"错误信息: {e}")
         return
 
     print(f"参考图片尺寸: {reference_img.shape[1]} x {reference_img.shape[0]}")
+
+    # 参考图片只需缩放和灰度化一次
+    reference_gray = prepare_for_ssim(reference_img)
+
     print(f"输入文件夹: {input_folder}")
     print(f"输出文件夹: {output_folder}")
     print("=" * 70)
 
     # 获取所有图片文件
-    image_files = (
-        list(input_path.glob("*.png"))
-        + list(input_path.glob("*.jpg"))
-        + list(input_path.glob("*.jpeg"))
-    )
+    image_files = list_image_files(input_path)
 
     if not image_files:
         print(f"错误: 在 {input_folder} 中未找到图片文件")
@@ -183,55 +493,90 @@ def batch_correct_with_template(input_folder, output_folder, reference_image):
     failed_count = 0
     manual_check_count = 0
 
-    # 处理每张图片
-    for idx, img_file in enumerate(image_files, 1):
-        print(f"[{idx}/{len(image_files)}] 处理: {img_file.name}")
-
-        # 查找最佳旋转角度
-        angle, similarity, scores, needs_manual_check = find_correct_rotation(
-            str(img_file), reference_img
+    # 多进程并行处理，预处理后的参考图片在每个子进程启动时传入一次
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(reference_gray,),
+    ) as executor:
+        # 第一步：并行计算所有图片各角度的相似度
+        score_results = list(executor.map(_score_one, image_files, chunksize=4))
+
+        # 第二步：汇总为 (N, 4) 矩阵，一次性选出最佳角度并判断是否需要人工检查
+        valid_files = [
+            img_file
+            for img_file, (scores, _) in zip(image_files, score_results)
+            if scores is not None
+        ]
+        scores_matrix = np.array(
+            [scores for scores, _ in score_results if scores is not None]
+        ).reshape(-1, len(ANGLES))
+        angles, similarities, similarity_diffs, needs_manual_checks = (
+            select_rotations(scores_matrix)
         )
 
-        # 显示所有角度的相似度
-        print(f"  相似度分析:")
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        for deg in [0, 90, 180, 270]:
-            marker = "★" if deg == angle else " "
-            print(f"    {marker} {deg:3d}°: {scores[deg]:.4f}")
-
-        # 显示相似度差异
-        similarity_diff = sorted_scores[0][1] - sorted_scores[1][1]
-        print(f"  相似度差异: {similarity_diff:.4f} (阈值: {SIMILARITY_THRESHOLD})")
+        # 第三步：并行旋转并保存
+        output_files = [
+            (manual_check_path if needs_manual_check else output_path) / img_file.name
+            for img_file, needs_manual_check in zip(valid_files, needs_manual_checks)
+        ]
+        save_tasks = [
+            (img_file, int(angle), output_file)
+            for img_file, angle, output_file in zip(valid_files, angles, output_files)
+        ]
+        saved = executor.map(_save_rotated, save_tasks, chunksize=4)
+
+        row = 0
+        for idx, (img_file, (scores, error)) in enumerate(
+            zip(image_files, score_results), 1
+        ):
+            progress = f"[{idx}/{len(image_files)}] {img_file.name}"
+
+            if scores is None:
+                failed_count += 1
+                logger.warning(f"{progress}  ✗ {error}")
+                continue
+
+            angle = int(angles[row])
+            similarity = similarities[row]
+            similarity_diff = similarity_diffs[row]
+            output_file = output_files[row]
+            needs_manual_check = needs_manual_checks[row]
+            row += 1
+
+            # 等待该图片保存完成
+            save_error = next(saved)
+            if save_error is not None:
+                failed_count += 1
+                logger.warning(f"{progress}  ✗ 保存失败: {save_error}")
+                continue
+
+            if angle != 0:
+                corrected_count += 1
+            else:
+                already_correct_count += 1
+            if needs_manual_check:
+                manual_check_count += 1
+
+            # 每张图片只输出一行，详细信息在DEBUG级别显示
+            logger.info(
+                f"{progress}  旋转 {angle}°  相似度 {similarity:.4f}"
+                + ("  ⚠️  需人工检查" if needs_manual_check else "")
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                for deg, score in zip(ANGLES, scores):
+                    marker = "★" if deg == angle else " "
+                    if np.isfinite(score):
+                        logger.debug(f"    {marker} {deg:3d}°: {score:.4f}")
+                    else:
+                        logger.debug(f"    {marker} {deg:3d}°: 跳过")
+                logger.debug(
+                    f"  相似度差异: {similarity_diff:.4f} "
+                    f"(阈值: {SIMILARITY_THRESHOLD})"
+                )
+                logger.debug(f"  保存至: {output_file}")
 
-        # 读取并旋转图片（使用PIL以保持高质量）
-        img = Image.open(img_file)
-
-        if angle != 0:
-            # PIL的旋转是逆时针，OpenCV是顺时针，需要转换
-            pil_angle = 360 - angle if angle != 0 else 0
-            img_rotated = img.rotate(pil_angle, expand=True)
-            corrected_count += 1
-            status_msg = f"  ✓ 已矫正: 旋转 {angle}° (相似度: {similarity:.4f})"
-        else:
-            img_rotated = img
-            already_correct_count += 1
-            status_msg = f"  ✓ 方向正确: 无需旋转 (相似度: {similarity:.4f})"
-
-        # 判断是否需要人工检查
-        if needs_manual_check:
-            manual_check_count += 1
-            output_file = manual_check_path / img_file.name
-            print(f"  ⚠️  警告: 多个角度相似度接近，建议人工检查！")
-            print(status_msg)
-            print(f"  保存至人工检查文件夹: {output_file}")
-        else:
-            output_file = output_path / img_file.name
-            print(status_msg)
-            print(f"  保存至: {output_file}")
-
-        # 保存图片
-        img_rotated.save(output_file)
-        print()
+    print()
 
     # 显示统计结果
     print("=" * 70)
@@ -258,6 +603,9 @@ def main():
     input_folder = "input"
     output_folder = "output"
 
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(LOG_LEVEL)
+
     print("=" * 70)
     print("图片方向自动矫正工具")
     print("=" * 70)
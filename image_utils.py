@@ -0,0 +1,71 @@
+"""
+图片处理脚本共用的工具函数和常量
+"""
+
+from pathlib import Path
+import logging
+import logging.handlers
+import queue
+import os
+
+# 支持的图片扩展名（不区分大小写）
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# PNG保存压缩级别：比PIL默认的6快得多，无损，只是文件略大
+PNG_COMPRESS_LEVEL = 1
+
+# 子进程中缓存日志记录的队列，由 init_worker_logging 在每个子进程启动时创建
+_log_queue = None
+
+
+def list_image_files(folder):
+    """
+    获取文件夹中的所有图片文件（扩展名不区分大小写）
+
+    Args:
+        folder: 文件夹路径
+
+    Returns:
+        list: 按文件名排序的图片路径列表
+    """
+    if not Path(folder).is_dir():
+        return []
+
+    # 一次遍历目录，scandir同时返回文件类型，无需额外的stat调用
+    with os.scandir(folder) as entries:
+        image_files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+
+    return sorted(image_files)
+
+
+def init_worker_logging(logger, log_level):
+    """
+    子进程日志初始化：日志记录先缓存在子进程中，随处理结果交给主进程输出
+    （子进程直接写控制台会与主进程的输出交错，并打断进度条）
+
+    Args:
+        logger: 子进程中脚本模块的logger
+        log_level: 日志级别
+    """
+    global _log_queue
+    _log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    logger.propagate = False
+    logger.setLevel(log_level)
+
+
+def drain_log_records():
+    """
+    取出子进程中缓存的日志记录
+
+    Returns:
+        list: 日志记录列表，由主进程用 logger.handle 输出
+    """
+    records = []
+    while not _log_queue.empty():
+        records.append(_log_queue.get())
+    return records
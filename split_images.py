@@ -4,14 +4,28 @@
 """
 
 from pathlib import Path
-from PIL import Image
+from PIL import Image, JpegImagePlugin
+from concurrent.futures import ProcessPoolExecutor
+import logging
 import sys
 import io
 
+from image_utils import (
+    PNG_COMPRESS_LEVEL,
+    drain_log_records,
+    init_worker_logging,
+    list_image_files,
+)
+
 # 设置Windows控制台输出编码为UTF-8
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
+logger = logging.getLogger(__name__)
+
+# 日志级别：改为 logging.DEBUG 可显示每张图片的尺寸和提取区域
+LOG_LEVEL = logging.INFO
+
 
 def extract_part_from_image(image_path, output_folder, part_index=1, direction='horizontal'):
     """
@@ -40,7 +54,8 @@ def extract_part_from_image(image_path, output_folder, part_index=1, direction='
     image = Image.open(img_path)
     width, height = image.size
     
-    print(f"  原始尺寸: {width} × {height}")
+    # 详细信息汇总为一条日志，多进程输出时不会与其他图片交错
+    details = [f"  {img_path.name}", f"    原始尺寸: {width} × {height}"]
     
     # 验证part_index
     if part_index not in [1, 2, 3]:
@@ -57,7 +72,7 @@ def extract_part_from_image(image_path, output_folder, part_index=1, direction='
         
         # 裁剪指定部分
         extracted_image = image.crop((left, 0, right, height))
-        print(f"  提取第 {part_index} 部分（{'左' if i==0 else '中' if i==1 else '右'}）: [{left}, 0, {right}, {height}]")
+        details.append(f"    提取第 {part_index} 部分（{'左' if i==0 else '中' if i==1 else '右'}）: [{left}, 0, {right}, {height}]")
     
     else:  # vertical
         # 垂直三等分
@@ -67,19 +82,64 @@ def extract_part_from_image(image_path, output_folder, part_index=1, direction='
         
         # 裁剪指定部分
         extracted_image = image.crop((0, top, width, bottom))
-        print(f"  提取第 {part_index} 部分（{'上' if i==0 else '中' if i==1 else '下'}）: [0, {top}, {width}, {bottom}]")
+        details.append(f"    提取第 {part_index} 部分（{'上' if i==0 else '中' if i==1 else '下'}）: [0, {top}, {width}, {bottom}]")
     
     # 生成输出文件名（不带part后缀，直接使用原文件名）
     output_file = output_path / img_path.name
     
-    # 保存
-    extracted_image.save(output_file)
-    print(f"  提取尺寸: {extracted_image.size[0]} × {extracted_image.size[1]}")
+    # 保存：JPEG沿用原图的量化表和色度采样，画质与原图一致，
+    # 不会按默认质量再压缩一次（裁剪后的图片无法直接使用 quality="keep"）
+    save_options = {"compress_level": PNG_COMPRESS_LEVEL}
+    if image.format == "JPEG":
+        save_options["qtables"] = image.quantization
+        save_options["subsampling"] = JpegImagePlugin.get_sampling(image)
+    extracted_image.save(output_file, **save_options)
+    details.append(f"    提取尺寸: {extracted_image.size[0]} × {extracted_image.size[1]}")
+    logger.debug("\n".join(details))
     
     return output_file
 
 
-def batch_extract_part(input_folder, output_folder, part_index=1, direction='horizontal'):
+def _init_worker(log_level):
+    """
+    子进程初始化：日志交给主进程输出
+    
+    Args:
+        log_level: 日志级别
+    """
+    init_worker_logging(logger, log_level)
+
+
+def _extract_one(task):
+    """
+    提取单张图片的指定部分（在子进程中运行）
+    
+    Args:
+        task: (图片路径, 输出文件夹, 部分索引, 分割方向)
+        
+    Returns:
+        tuple: (保存的文件路径, 错误信息, 日志记录列表)，失败时文件路径为None
+    """
+    img_file, output_folder, part_index, direction = task
+    output_file, error = None, None
+    
+    try:
+        output_file = extract_part_from_image(
+            str(img_file), 
+            output_folder, 
+            part_index=part_index,
+            direction=direction
+        )
+        
+    except Exception as e:
+        error = str(e)
+    
+    return output_file, error, drain_log_records()
+
+
+def batch_extract_part(
+    input_folder, output_folder, part_index=1, direction='horizontal', max_workers=None
+):
     """
     批量处理文件夹中的所有图片，只提取指定部分
     
@@ -88,6 +148,7 @@ def batch_extract_part(input_folder, output_folder, part_index=1, direction='hor
         output_folder: 输出文件夹路径
         part_index: 要保存的部分索引（1, 2, 或 3）
         direction: 分割方向，'horizontal'（水平）或 'vertical'（垂直）
+        max_workers: 并行处理的进程数，默认为CPU核心数
     """
     input_path = Path(input_folder)
     
@@ -103,11 +164,7 @@ def batch_extract_part(input_folder, output_folder, part_index=1, direction='hor
     print("=" * 70)
     
     # 获取所有图片文件
-    image_files = (
-        list(input_path.glob("*.png"))
-        + list(input_path.glob("*.jpg"))
-        + list(input_path.glob("*.jpeg"))
-    )
+    image_files = list_image_files(input_path)
     
     if not image_files:
         print(f"错误: 在 {input_folder} 中未找到图片文件")
@@ -119,26 +176,36 @@ def batch_extract_part(input_folder, output_folder, part_index=1, direction='hor
     success_count = 0
     failed_count = 0
     
-    # 处理每张图片
-    for idx, img_file in enumerate(image_files, 1):
-        print(f"[{idx}/{len(image_files)}] 处理: {img_file.name}")
+    # 多进程并行处理，结果按原顺序返回
+    tasks = [
+        (img_file, output_folder, part_index, direction)
+        for img_file in image_files
+    ]
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(logger.getEffectiveLevel(),),
+    ) as executor:
+        results = executor.map(_extract_one, tasks, chunksize=4)
         
-        try:
-            output_file = extract_part_from_image(
-                str(img_file), 
-                output_folder, 
-                part_index=part_index,
-                direction=direction
-            )
+        for idx, (img_file, (output_file, error, records)) in enumerate(
+            zip(image_files, results), 1
+        ):
+            progress = f"[{idx}/{len(image_files)}] {img_file.name}"
             
-            print(f"  ✓ 保存至: {output_file.name}")
-            success_count += 1
+            # 每张图片只输出一行，详细信息在DEBUG级别显示
+            if error is None:
+                success_count += 1
+                logger.info(f"{progress}  ✓ 保存至: {output_file.name}")
+            else:
+                failed_count += 1
+                logger.warning(f"{progress}  ✗ 处理失败: {error}")
             
-        except Exception as e:
-            print(f"  ✗ 处理失败: {e}")
-            failed_count += 1
-        
-        print()
+            # 子进程的详细信息跟在该图片的结果之后输出
+            for record in records:
+                logger.handle(record)
+    
+    print()
     
     # 显示统计结果
     print("=" * 70)
@@ -151,6 +218,9 @@ def batch_extract_part(input_folder, output_folder, part_index=1, direction='hor
 
 def main():
     """主函数"""
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(LOG_LEVEL)
+    
     print("=" * 70)
     print("图片三等分提取工具（单一部分提取）")
     print("=" * 70)